@@ -33,10 +33,35 @@ Version: 1.0
 Currently supported controls file:           jadl_controls_v1.4.ds
 Currently supported pdg controls file:       jadl_pdg_v1.0.ds
 '''
-import hou
-import json
+import copy
 import os.path
 
+# hou is deliberately NOT imported at module level. Everything here works
+# through node/parm handles except set_detail_attrs, which imports it
+# locally. PDG-spawned python processes that only need generate_work_items +
+# load_json_data skip the (slow) Houdini module init entirely.
+
+# orjson is a C extension that parses and serializes JSON several times
+# faster than the stdlib, which matters for large asset libraries. It is
+# optional; fall back to the stdlib if the current Houdini python doesn't
+# have it. Both paths work in bytes so the file IO can stay binary.
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(json_data):
+        return orjson.dumps(json_data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(json_data):
+        return json.dumps(json_data, indent=4).encode()
+
 # JSON Keys
 JK_ALL_DEFS = 'asset_definitions'
 JK_ASSET_NAME = 'name'
@@ -52,6 +77,9 @@ MULTIPARM_INDEX_WILDCARD = '#'
 
 # Cached User Data Ids
 CUD_JSON_DATA = 'json_data'
+CUD_MENU_INDEX_MAP = 'menu_index_map'
+CUD_LOGGING_ENABLED = 'logging_enabled'
+CUD_TYPE_IS_HDAPROCESSOR = 'type_is_hdaprocessor'
 
 # Houdini Node Parm IDs
 PI_ASSET_DEFS_ENABLED = 'asset_defs_enabled'
@@ -67,20 +95,51 @@ PI_CREATE_MISSING_FILE = 'create_missing_file'
 WIA_ASSET_NAME = 'asset_name'
 WIA_ASSET_INDEX = 'asset_index'
 
+# Last detail attribute values written per target node, keyed by the node's
+# sessionId(). Lets repeated cooks with identical parm values skip the
+# attribute writes entirely.
+_LAST_ATTRS = {}
+
+# Parsed JSON shared across all nodes in the session, keyed by file path.
+# Entries are validated against the file's (mtime, size), so edits made to
+# the file outside of Houdini are still picked up. Callers always get a deep
+# copy so per-node mutations can't leak into other nodes.
+_FILE_CACHE = {}
+
 def about():
     print('************* JSON Asset Definition Library v1.0.0 ****************')
     print('Currently supported controls file:           jadl_controls_v1.4.ds')
     print('Currently supported pdg controls file:       jadl_pdg_v1.0.ds')
     print('*******************************************************************')
 
+# Returns whether logging is enabled for this node, or None if the logging
+# parm is missing. log() gets called from hot loops, so the flag is memoized
+# on the node rather than resolving and evaluating the parm every message.
+# force_reload clears the memo; toggling the parm mid-session takes effect on
+# the next reload.
+def get_logging_enabled(node):
+    cached_value = node.cachedUserData(CUD_LOGGING_ENABLED)
+
+    if (cached_value is not None):
+        return cached_value
+
+    logging_parm = node.parm(PI_ENABLE_LOGGING)
+
+    if (not logging_parm):
+        return None
+
+    logging_enabled = bool(logging_parm.eval())
+    node.setCachedUserData(CUD_LOGGING_ENABLED, logging_enabled)
+    return logging_enabled
+
 def log(node, msg, check_enabled=True):
     if (check_enabled):
-        logging_parm = node.parm(PI_ENABLE_LOGGING)
+        logging_enabled = get_logging_enabled(node)
 
-        if (not logging_parm):
+        if (logging_enabled is None):
             print('WARNING: missing logging parm (' + PI_ENABLE_LOGGING + ') (original message: ' + msg + ')')
             return
-        if (not logging_parm.eval()):
+        if (not logging_enabled):
             return
 
     print(msg)
@@ -111,37 +170,119 @@ def clear_multiparm_parent(node, parm):
     if (multiparm_controller):
         multiparm_controller.set(0)
 
-def extract_multiparm_data(parm):
-    parent_name = parm.parentMultiParm().name()
-    tokens = parm.name().split('_')
-    last_token = tokens[len(tokens) - 1]
+# Pure string op: splits a multiparm instance parm name into its instance
+# index and wildcard form, e.g. 'pi_foo_2' -> (1, 'pi_foo_#').
+#
+# Only the last token matters, so rsplit instead of building the full token
+# list. This runs once per linked parm, so the saved allocations add up on
+# nodes with lots of multiparm instances.
+def split_multiparm_name(name):
+    head, last_token = name.rsplit('_', 1)
     multiparm_index = int(last_token[0]) - 1
-    tokens[len(tokens) - 1] = MULTIPARM_INDEX_WILDCARD + last_token[1:]
-    wildcard_parm_id = '_'.join(tokens)
+    wildcard_parm_id = head + '_' + MULTIPARM_INDEX_WILDCARD + last_token[1:]
+    return (multiparm_index, wildcard_parm_id)
+
+def extract_multiparm_data(parm, parent_name_cache=None):
+    multiparm_index, wildcard_parm_id = split_multiparm_name(parm.name())
+
+    # Sibling instances share a parent, and parentMultiParm() is a separate
+    # Houdini lookup per call. Callers iterating many instance parms pass a
+    # dict here so the lookup only happens once per wildcard id.
+    if (parent_name_cache is None):
+        parent_name = parm.parentMultiParm().name()
+    else:
+        parent_name = parent_name_cache.get(wildcard_parm_id)
+
+        if (parent_name is None):
+            parent_name = parm.parentMultiParm().name()
+            parent_name_cache[wildcard_parm_id] = parent_name
+
     return (parent_name, multiparm_index, wildcard_parm_id)
 
-def add_or_set_detail_attr(node, attr_id, value):
+# Writes a batch of (attr_id, value) pairs as detail attributes. Grabbing the
+# geometry and the set of existing attribute names once per batch replaces a
+# findGlobalAttrib() call per attribute, which is the dominant cost when
+# loading definitions with 100+ attributes.
+def set_detail_attrs(node, attr_values, last_values=None):
+    import hou # deferred; see the note at the top of the module
+
     geo = node.geometry()
+    existing_attr_ids = {attrib.name() for attrib in geo.globalAttribs()}
+
+    for attr_id, value in attr_values:
+        if (attr_id not in existing_attr_ids):
+            geo.addAttrib(hou.attribType.Global, attr_id, value)
+            existing_attr_ids.add(attr_id)
+        elif (last_values is not None and last_values.get(attr_id) == value):
+            # The attribute exists and already holds this value from an
+            # earlier cook, so the write can be skipped outright.
+            continue
 
-    existing_attribute = geo.findGlobalAttrib(attr_id)
-    if (existing_attribute):
         try:
             geo.setGlobalAttribValue(attr_id, value)
+
+            if (last_values is not None):
+                last_values[attr_id] = value
         except hou.OperationFailed as ex:
             log(
                 None,
-                'Failed to update detail attribute on node. This is ' + 
+                'Failed to update detail attribute on node. This is ' +
                 'most likely caused by a type mismatch between your JSON ' +
-                'data and existing attribute type. ' + 
+                'data and existing attribute type. ' +
                 '\nOriginal error: \n' + repr(ex) + ' ' + str(ex),
                 False
             )
-    else:
-        geo.addAttrib(hou.attribType.Global, attr_id, value)
-        geo.setGlobalAttribValue(attr_id, value)
+
+def add_or_set_detail_attr(node, attr_id, value):
+    set_detail_attrs(node, [(attr_id, value)])
+
+# Walks node.parms() once and partitions the parm names by prefix. Returns a
+# (parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set)
+# tuple. The lists preserve node.parms() order -- set iteration order is hash
+# randomized per session, and both the saved JSON key order and the order
+# detail attributes get created in depend on walking parms deterministically.
+# The sets exist purely for O(1) membership tests.
+def partition_parms(node):
+    parms_by_name = {}
+    parm_ids = []
+    multiparm_ids = []
+    parm_id_set = set()
+    multiparm_id_set = set()
+
+    # Bind the module-level constants to locals: global name lookups inside
+    # this loop are measurable on nodes with thousands of parms. Comparing a
+    # slice against the prefix also skips the startswith method dispatch,
+    # which is the hottest micro-op in this module.
+    pi_prefix = PARM_ID_PREFIX
+    pi_len = len(pi_prefix)
+    mpi_prefix = MULTIPARM_ID_PREFIX
+    mpi_len = len(mpi_prefix)
+
+    for parm in node.parms():
+        parm_id = parm.name()
+        parms_by_name[parm_id] = parm
+
+        if (parm_id[:pi_len] == pi_prefix):
+            parm_ids.append(parm_id)
+            parm_id_set.add(parm_id)
+        elif (parm_id[:mpi_len] == mpi_prefix):
+            multiparm_ids.append(parm_id)
+            multiparm_id_set.add(parm_id)
+
+    return (parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set)
 
 def is_manual_mode(node):
-    if (node.type().name() == 'hdaprocessor'):
+    # This runs at the start of every public entry point, and node.type()
+    # plus .name() are two separate Houdini lookups. A node's type can't
+    # change during a session, so the hdaprocessor check is memoized per node
+    # and never needs invalidating; only the parm evals remain per call.
+    type_is_hdaprocessor = node.cachedUserData(CUD_TYPE_IS_HDAPROCESSOR)
+
+    if (type_is_hdaprocessor is None):
+        type_is_hdaprocessor = (node.type().name() == 'hdaprocessor')
+        node.setCachedUserData(CUD_TYPE_IS_HDAPROCESSOR, type_is_hdaprocessor)
+
+    if (type_is_hdaprocessor):
         return False
 
     return (
@@ -175,8 +316,8 @@ def load_json_data(node, path=None):
         return json_data
 
     if (not os.path.isfile(json_file_path) and create_if_missing):
-        with open(json_file_path, 'w') as new_file:
-            json.dump(json_data, new_file)
+        with open(json_file_path, 'wb') as new_file:
+            new_file.write(_dumps(json_data))
 
 
     if (os.path.isfile(json_file_path)):
@@ -185,8 +326,17 @@ def load_json_data(node, path=None):
         log(node, 'unable to load json data. file is missing: ' + json_file_path, False)
         return json_data
 
-    with open(json_file_path, 'r') as json_file:
-        json_data = json.load(json_file)
+    file_stat = os.stat(json_file_path)
+    file_key = (file_stat.st_mtime, file_stat.st_size)
+    cached_entry = _FILE_CACHE.get(json_file_path)
+
+    if (cached_entry and cached_entry[0] == file_key):
+        return copy.deepcopy(cached_entry[1])
+
+    with open(json_file_path, 'rb') as json_file:
+        json_data = _loads(json_file.read())
+
+    _FILE_CACHE[json_file_path] = (file_key, copy.deepcopy(json_data))
 
     return json_data
 
@@ -206,18 +356,46 @@ def get_cached_json_data(node):
 
     return cached_node_data.get(CUD_JSON_DATA, {})
 
+def get_menu_index_map(node, menu_labels):
+    # The map is memoized on the node, keyed by the labels tuple itself, so
+    # repeated callbacks (e.g. parm_changed firing during a slider drag) skip
+    # rebuilding it. force_reload clears this alongside CUD_JSON_DATA.
+    labels_key = tuple(menu_labels)
+    cached_map = node.cachedUserData(CUD_MENU_INDEX_MAP)
+
+    if (cached_map and cached_map[0] == labels_key):
+        return cached_map[1]
+
+    index_map = {}
+
+    # setdefault keeps the FIRST index for a duplicated label, matching what
+    # menu_labels.index() used to return when a hand-edited library contains
+    # two asset defs with the same name.
+    for index, label in enumerate(menu_labels):
+        index_map.setdefault(label, index)
+
+    node.setCachedUserData(CUD_MENU_INDEX_MAP, (labels_key, index_map))
+    return index_map
+
+# Returns (menu_labels, index_map) for the asset definition menu. One parm
+# resolution and one menuLabels() call per UI event instead of one per
+# callsite, with the label -> index map memoized via get_menu_index_map.
+def get_menu_labels(node):
+    menu_labels = node.parm(PI_ASSET_MENU).menuLabels()
+    return (menu_labels, get_menu_index_map(node, menu_labels))
+
 def get_asset_def_index(node):
     asset_def_name = node.evalParm(PI_ASSET_ID)
-    menu_labels = node.parm(PI_ASSET_MENU).menuLabels()
+    menu_labels, index_map = get_menu_labels(node)
 
-    if (asset_def_name == '' or asset_def_name not in menu_labels):
+    if (asset_def_name == ''):
         return max(len(menu_labels) - 1, 0)
 
     # Match the asset definition index to whatever is currently in the name
     # field, NOT which menu item is actually selected. This fixes bugs that
     # manifest when the user picks an asset def, changes the PI_ASSET_ID
     # text field, then presses the save button.
-    return menu_labels.index(asset_def_name)
+    return index_map.get(asset_def_name, max(len(menu_labels) - 1, 0))
 
 def update_changed_parms(node):
     print('update_changed_parms is DEPRECATED. Use parm_changed.')
@@ -236,6 +414,15 @@ Usage:
     __import__('jadl').parm_changed(kwargs['node'], kwargs['parm'])
 """
 def parm_changed(node, target_parm):
+    # Check the mode first: everything in this fn (including the multiparm
+    # controller mirroring) only applies to manually controlled nodes, and
+    # the check is far cheaper than the scans below. Automated (PDG) nodes
+    # shouldn't wire up these callbacks at all, but if one fires anyway --
+    # e.g. the menu callback's parm_changed(node, None) -- it returns here
+    # without paying for any scanning.
+    if (not is_manual_mode(node)):
+        return
+
     if (target_parm):
         target_name = target_parm.name()
         if (target_name.startswith(MULTIPARM_CONTROLLER_PREFIX)):
@@ -245,9 +432,6 @@ def parm_changed(node, target_parm):
                 log(None, 'WARNING: expected node named "' + multiparm_parent_name + '" to exist.', False)
 
             multiparm_parent.set(target_parm.eval())
-    
-    if (not is_manual_mode(node)):
-        return
 
     asset_def_index = get_asset_def_index(node)
 
@@ -257,7 +441,9 @@ def parm_changed(node, target_parm):
     
     asset_defs = json_data[JK_ALL_DEFS]
 
-    if (asset_defs is None or asset_def_index > len(asset_defs)):
+    # get_empty_json_data guarantees the key exists, but the file itself may
+    # hold junk, so check the type rather than None.
+    if (not isinstance(asset_defs, list) or asset_def_index > len(asset_defs)):
         return
     if (asset_def_index == len(asset_defs)):
         node.parm(PI_CHANGED_PARM_COUNT).set(-1)
@@ -265,27 +451,30 @@ def parm_changed(node, target_parm):
 
     current_asset = asset_defs[asset_def_index]
     changed_parms = 0
-    all_parms = set()
-    all_multiparms = set()
     changed_parm_names = set() # for debugging
 
-    # scan JSON data
-    for parm_id in current_asset:
-        if (parm_id.startswith(PARM_ID_PREFIX)):
-            all_parms.add(parm_id)
-        elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
-            all_multiparms.add(parm_id)
+    # Grab all the node's parms in a single pass. Every node.parm(name) call
+    # is a separate lookup inside Houdini, so for nodes with many linked parms
+    # it is much cheaper to resolve parms through this dict. The comparison
+    # sets below just count changes, so they don't care about parm order and
+    # can start from the partition's membership sets.
+    parms_by_name, parm_ids, multiparm_ids, all_parms, all_multiparms = partition_parms(node)
 
-    # scan node
-    for parm in node.parms():
-        parm_id = parm.name()
-        if (parm_id.startswith(PARM_ID_PREFIX)):
+    # scan JSON data (slice compares over startswith for the same reason as
+    # partition_parms)
+    pi_prefix = PARM_ID_PREFIX
+    pi_len = len(pi_prefix)
+    mpi_prefix = MULTIPARM_ID_PREFIX
+    mpi_len = len(mpi_prefix)
+
+    for parm_id in current_asset:
+        if (parm_id[:pi_len] == pi_prefix):
             all_parms.add(parm_id)
-        elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
+        elif (parm_id[:mpi_len] == mpi_prefix):
             all_multiparms.add(parm_id)
 
     for multiparm_id in all_multiparms:
-        parm = node.parm(multiparm_id)
+        parm = parms_by_name.get(multiparm_id)
         if (not parm):
             log(None, 'Warning: multiparm "{}" is null'.format(multiparm_id), False)
             continue
@@ -295,31 +484,34 @@ def parm_changed(node, target_parm):
             continue
         
         multiparm_count = parm.eval()
+        json_multiparm = current_asset.get(multiparm_id)
 
         if (
                 # it's okay if the multiparm is empty in the UI and missing in
                 # the JSON file, but not if it is empty in the UI and present
                 # in the JSON file.
                 multiparm_count == 0 and
-                multiparm_id in current_asset and
-                multiparm_count != len(current_asset[multiparm_id])
+                json_multiparm is not None and
+                multiparm_count != len(json_multiparm)
             ) or (
                 multiparm_count > 0 and (
-                    multiparm_id not in current_asset or 
-                    multiparm_count != len(current_asset[multiparm_id])
+                    json_multiparm is None or
+                    multiparm_count != len(json_multiparm)
             )
         ):
             changed_parms += 1
             changed_parm_names.add(multiparm_id)
     
+    parent_name_cache = {}
+
     for parm_id in all_parms:
-        parm = node.parm(parm_id)
+        parm = parms_by_name.get(parm_id)
         if (not parm):
             log(None, 'Warning: parm "{}" is null'.format(parm_id), False)
             continue
 
         if (parm.isMultiParmInstance()):
-            parent_name, multiparm_index, wildcard_id = extract_multiparm_data(parm)
+            parent_name, multiparm_index, wildcard_id = extract_multiparm_data(parm, parent_name_cache)
             if (parent_name not in current_asset):
                 continue
             multiparm_list = current_asset[parent_name]
@@ -344,18 +536,13 @@ def clear_asset_defs(node):
         log(node, 'error: tried to call clear_asset_defs for automated process.')
         return
                 
-    multiparms_to_clear = []
+    parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set = partition_parms(node)
 
-    for parm in node.parms():
-        parm_id = parm.name()
+    for parm_id in parm_ids:
+        parms_by_name[parm_id].revertToDefaults()
 
-        if (parm_id.startswith(PARM_ID_PREFIX)):
-            parm.revertToDefaults()
-        elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
-                multiparms_to_clear.append(parm)
-        
-    for parm in multiparms_to_clear:
-        clear_multiparm_parent(node, parm)
+    for parm_id in multiparm_ids:
+        clear_multiparm_parent(node, parms_by_name[parm_id])
 
 def set_manual_controls(node, reset_parms=True):
     if (not is_manual_mode(node)):
@@ -367,7 +554,9 @@ def set_manual_controls(node, reset_parms=True):
     json_data = get_cached_json_data(node)
     asset_defs = json_data[JK_ALL_DEFS]
 
-    if (asset_defs is None or asset_def_index > len(asset_defs)):
+    # get_empty_json_data guarantees the key exists, but the file itself may
+    # hold junk, so check the type rather than None.
+    if (not isinstance(asset_defs, list) or asset_def_index > len(asset_defs)):
         return
 
     # We need to always revert everything to default first because the
@@ -386,19 +575,28 @@ def set_manual_controls(node, reset_parms=True):
 
     current_asset = asset_defs[asset_def_index]
 
+    # Grab all the node's parms once up front so we can resolve each linked
+    # parm with a dict lookup instead of a node.parm() call. Note that any
+    # multiparm instance parms created below will NOT be in this dict, so
+    # those still have to go through node.parm().
+    parms_by_name = {parm.name(): parm for parm in node.parms()}
+
+    pi_prefix = PARM_ID_PREFIX
+    mpi_prefix = MULTIPARM_ID_PREFIX
+
     for parm_id, value in current_asset.items():
-        if (parm_id.startswith(PARM_ID_PREFIX)):
-            current_parameter = node.parm(parm_id)
+        if (parm_id.startswith(pi_prefix)):
+            current_parameter = parms_by_name.get(parm_id)
 
             if (current_parameter):
-                node.parm(parm_id).set(value)
+                current_parameter.set(value)
             else:
                 log(node, 'Warning: found unknown parameter name in json file (' + parm_id + ')')
-        elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
+        elif (parm_id.startswith(mpi_prefix)):
             instance_count = len(value)
-            node.parm(parm_id).set(instance_count)
-            multiparm_controller_name = MULTIPARM_CONTROLLER_PREFIX + parm_id.removeprefix(MULTIPARM_ID_PREFIX)
-            multiparm_controller = node.parm(multiparm_controller_name)
+            parms_by_name[parm_id].set(instance_count)
+            multiparm_controller_name = MULTIPARM_CONTROLLER_PREFIX + parm_id.removeprefix(mpi_prefix)
+            multiparm_controller = parms_by_name.get(multiparm_controller_name)
             if (multiparm_controller):
                 multiparm_controller.set(instance_count)
 
@@ -406,9 +604,9 @@ def set_manual_controls(node, reset_parms=True):
 
             for multiparm_map in value:
                 for multiparm_id, multiparm_value in multiparm_map.items():
-                    if (not multiparm_id.startswith(PARM_ID_PREFIX)):
+                    if (not multiparm_id.startswith(pi_prefix)):
                         continue
-                    
+
                     indexed_id = multiparm_id.replace(MULTIPARM_INDEX_WILDCARD, str(multiparm_index))
                     node.parm(indexed_id).set(multiparm_value)
                 multiparm_index += 1
@@ -417,7 +615,7 @@ def asset_def_menu_callback(node, reset_parms=True):
     if (not is_manual_mode(node)):
         return
 
-    menu_labels = node.parm(PI_ASSET_MENU).menuLabels()
+    menu_labels, index_map = get_menu_labels(node)
 
     if (not menu_labels):
         log(node, 'warning: expected there to be at least one menu label')
@@ -435,14 +633,12 @@ def asset_def_menu_callback(node, reset_parms=True):
     set_manual_controls(node, reset_parms)
     parm_changed(node, None)
 
-def force_reload(node, menu_index=-1, reset_parms=True):
-    if (not is_manual_mode(node)):
-        return
-
-    if (node.cachedUserData(CUD_JSON_DATA)):
-        node.destroyCachedUserData(CUD_JSON_DATA)
-    json_data = get_cached_json_data(node)
-
+# Rebuilds the asset definition menu and reapplies the manual controls from
+# json_data, without touching the cached user data. Callers that already know
+# the cache is current (e.g. update_asset_def right after a save) use this
+# directly to skip re-parsing the file; everything else goes through
+# force_reload.
+def refresh_menu_and_ui(node, json_data, menu_index=-1, reset_parms=True):
     # This will force the asset definition menu to rebuild itself. It will not
     # actually trigger the internal network to recook.
     force_cook(node)
@@ -455,6 +651,19 @@ def force_reload(node, menu_index=-1, reset_parms=True):
         node.parm(PI_ASSET_MENU).set(menu_index)
     asset_def_menu_callback(node, reset_parms)
 
+def force_reload(node, menu_index=-1, reset_parms=True):
+    if (not is_manual_mode(node)):
+        return
+
+    if (node.cachedUserData(CUD_JSON_DATA)):
+        node.destroyCachedUserData(CUD_JSON_DATA)
+    if (node.cachedUserData(CUD_MENU_INDEX_MAP)):
+        node.destroyCachedUserData(CUD_MENU_INDEX_MAP)
+    if (node.cachedUserData(CUD_LOGGING_ENABLED) is not None):
+        node.destroyCachedUserData(CUD_LOGGING_ENABLED)
+    json_data = get_cached_json_data(node)
+    refresh_menu_and_ui(node, json_data, menu_index, reset_parms)
+
 def update_asset_def(node, is_delete=False):
     if (not is_manual_mode(node)):
         log(node, 'error: tried to call update_asset_def for automated process.')
@@ -465,7 +674,9 @@ def update_asset_def(node, is_delete=False):
     json_data = get_cached_json_data(node)
     asset_defs = json_data[JK_ALL_DEFS]
 
-    if (asset_defs is None or asset_def_index > len(asset_defs)):
+    # get_empty_json_data guarantees the key exists, but the file itself may
+    # hold junk, so check the type rather than None.
+    if (not isinstance(asset_defs, list) or asset_def_index > len(asset_defs)):
         return
     if (is_delete and asset_def_index == len(asset_defs)):
         log(node, 'error: invalid deletion index.')
@@ -476,33 +687,40 @@ def update_asset_def(node, is_delete=False):
     if (not is_delete):
         asset_def_name = node.evalParm(PI_ASSET_ID)
         asset_def_data[JK_ASSET_NAME] = asset_def_name
-        
-        for parm in node.parms():
-            parm_id = parm.name()
 
-            if (not parm_id.startswith(MULTIPARM_ID_PREFIX)):
-                continue
+        # node.parms() builds a fresh list of parm handles every call, so
+        # partition it once and reuse it for both passes below. The passes
+        # have to stay ordered -- every multiparm container must exist in
+        # asset_def_data before the instance parms index into it -- and both
+        # have to walk the ordered lists, NOT the sets: asset_def_data's key
+        # order ends up in the saved JSON, and it should stay stable across
+        # sessions so saves don't shuffle the file for version control.
+        parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set = partition_parms(node)
+
+        for parm_id in multiparm_ids:
+            parm = parms_by_name[parm_id]
 
             if (not parm.isMultiParmParent()):
-                log(None, 'Expected parm "' + parm.name() + '" to be a multiparm parent.', False)
+                log(None, 'Expected parm "' + parm_id + '" to be a multiparm parent.', False)
                 return
-            
+
             asset_def_data[parm_id] = [{} for _ in range(parm.eval())]
 
-        for parm in node.parms():
-            if (not parm.name().startswith(PARM_ID_PREFIX)):
-                continue
+        parent_name_cache = {}
+
+        for parm_id in parm_ids:
+            parm = parms_by_name[parm_id]
 
             if (parm.isMultiParmInstance()):
-                parent_name, multiparm_index, wildcard_id = extract_multiparm_data(parm)
+                parent_name, multiparm_index, wildcard_id = extract_multiparm_data(parm, parent_name_cache)
                 asset_def_data[parent_name][multiparm_index][wildcard_id] = parm.eval()
             else:
-                asset_def_data[parm.name()] = parm.eval()
+                asset_def_data[parm_id] = parm.eval()
 
     if (is_delete):
         asset_defs.pop(asset_def_index)
         asset_def_index = len(asset_defs)
-    elif (asset_def_index == len(asset_defs) or node.parm(PI_ASSET_MENU).menuLabels()[asset_def_index] != asset_def_name):
+    elif (asset_def_index == len(asset_defs) or get_menu_labels(node)[0][asset_def_index] != asset_def_name):
         # create new asset definition
         asset_def_index = len(asset_defs)
         asset_defs.append(asset_def_data)
@@ -510,8 +728,6 @@ def update_asset_def(node, is_delete=False):
         # edit existing asset definition
         asset_defs[asset_def_index] = asset_def_data
 
-    json_data[JK_ALL_DEFS] = asset_defs
-
     json_file_path = node.evalParm(PI_JSON_FILE_PATH)
     if (os.path.isfile(json_file_path) and json_file_path.lower().endswith('.json')):
         log(node, 'writing json data to: ' + json_file_path)
@@ -519,12 +735,26 @@ def update_asset_def(node, is_delete=False):
         log(node, 'unable to write json data. path is invalid: ' + json_file_path)
         return
 
-    json_serialized = json.dumps(json_data, indent=4)
+    json_serialized = _dumps(json_data)
+
+    # Write to a temp file and rename it into place. Opening the real path in
+    # write mode truncates it first, so a crash mid-write could destroy the
+    # library; os.replace is atomic on the same filesystem. The serialized
+    # bytes also go out in a single write call.
+    temp_file_path = json_file_path + '.tmp'
 
-    with open(json_file_path, 'w') as json_file:
+    with open(temp_file_path, 'wb') as json_file:
         json_file.write(json_serialized)
+    os.replace(temp_file_path, json_file_path)
+
+    # The file on disk just changed, so drop the stale shared cache entry.
+    _FILE_CACHE.pop(json_file_path, None)
 
-    force_reload(node, asset_def_index)
+    # json_data already matches what was just written, so push it straight
+    # into the node cache and refresh the UI instead of destroying the cache
+    # and re-parsing the file from disk.
+    node.setCachedUserData(CUD_JSON_DATA, json_data)
+    refresh_menu_and_ui(node, json_data, asset_def_index)
 
 def load_detail_attributes(generator_node, target_node, asset_index):
     if (eval_parm_safe(generator_node, PI_PDG_ENABLED)):
@@ -539,72 +769,89 @@ def load_detail_attributes(generator_node, target_node, asset_index):
             return
 
         asset_def = asset_defs[asset_index]
-        multiparms_to_clear = []
+        parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set = partition_parms(generator_node)
 
-        for parm in generator_node.parms():
-            parm_id = parm.name()
-                
-            if (parm_id.startswith(MULTIPARM_ID_PREFIX)):
-                multiparms_to_clear.append(parm)
-        for parm in multiparms_to_clear:
-            clear_multiparm_parent(generator_node, parm)
+        for parm_id in multiparm_ids:
+            clear_multiparm_parent(generator_node, parms_by_name[parm_id])
+
+        # Clearing the multiparms above destroyed any multiparm instance
+        # parms, so the partition has to be rebuilt before touching parms
+        # again.
+        parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set = partition_parms(generator_node)
+
+        # Collect every (attr_id, value) pair first, then write them all in
+        # one batch. Later pairs for the same id win, matching the old
+        # one-call-per-attr ordering.
+        attr_values = []
 
         # We revert all parms in the top level node to their defaults so that if
         # a parm is missing from the JSON file, we can just use the default
         # value from the top level node.
-        for parm in generator_node.parms():
-            parm_id = parm.name()
+        for parm_id in parm_ids:
+            parm = parms_by_name[parm_id]
+            stripped_id = parm_id.removeprefix(PARM_ID_PREFIX) # python 3.9+
 
-            if (parm_id.startswith(PARM_ID_PREFIX)):
-                stripped_id = parm_id.removeprefix(PARM_ID_PREFIX) # python 3.9+
+            # There does not appear to be a parm.getDefaultValue() fn, so instead
+            # we are just reverting the parm first and then grabbing its value.
+            parm.revertToDefaults()
+            attr_values.append((stripped_id, parm.eval()))
 
-                # There does not appear to be a parm.getDefaultValue() fn, so instead
-                # we are just reverting the parm first and then grabbing its value.
-                parm.revertToDefaults()
-                add_or_set_detail_attr(target_node, stripped_id, parm.eval())
+        pi_prefix = PARM_ID_PREFIX
+        mpi_prefix = MULTIPARM_ID_PREFIX
 
         for parm_id, value in asset_def.items():
             # Add parm from JSON file
-            if (parm_id.startswith(PARM_ID_PREFIX)):
-                stripped_id = parm_id.removeprefix(PARM_ID_PREFIX) # python 3.9+
-                add_or_set_detail_attr(target_node, stripped_id, value)
-            
+            if (parm_id.startswith(pi_prefix)):
+                stripped_id = parm_id.removeprefix(pi_prefix) # python 3.9+
+                attr_values.append((stripped_id, value))
+
             # Add multiparms from JSON file
-            elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
-                stripped_id = parm_id.removeprefix(MULTIPARM_ID_PREFIX) # python 3.9+
-                add_or_set_detail_attr(target_node, stripped_id, len(value))
+            elif (parm_id.startswith(mpi_prefix)):
+                stripped_id = parm_id.removeprefix(mpi_prefix) # python 3.9+
+                attr_values.append((stripped_id, len(value)))
 
                 multiparm_index = 1
 
                 for multiparm_map in value:
                     for multiparm_id, multiparm_value in multiparm_map.items():
-                        if (not multiparm_id.startswith(PARM_ID_PREFIX)):
+                        if (not multiparm_id.startswith(pi_prefix)):
                             continue
-                        
-                        stripped_id = multiparm_id.removeprefix(PARM_ID_PREFIX) # python 3.9+
+
+                        stripped_id = multiparm_id.removeprefix(pi_prefix) # python 3.9+
                         indexed_id = stripped_id.replace(MULTIPARM_INDEX_WILDCARD, str(multiparm_index))
-                        add_or_set_detail_attr(target_node, indexed_id, multiparm_value)
+                        attr_values.append((indexed_id, multiparm_value))
                     multiparm_index += 1
 
-        add_or_set_detail_attr(target_node, JK_ASSET_NAME, asset_def[JK_ASSET_NAME])
+        attr_values.append((JK_ASSET_NAME, asset_def[JK_ASSET_NAME]))
+        set_detail_attrs(target_node, attr_values)
 
     else:
-        for parm in generator_node.parms():
-            parm_id = parm.name()
-
-            if (parm_id.startswith(PARM_ID_PREFIX)):
+        parms_by_name, parm_ids, multiparm_ids, parm_id_set, multiparm_id_set = partition_parms(generator_node)
+        attr_values = []
+
+        # Walk parms_by_name (insertion order == node.parms() order) rather
+        # than the pi/mpi lists back to back, so the attributes get created
+        # in the same interleaved order as a plain parm walk.
+        for parm_id in parms_by_name:
+            if (parm_id in parm_id_set):
                 stripped_id = parm_id.removeprefix(PARM_ID_PREFIX) # python 3.9+
-                add_or_set_detail_attr(target_node, stripped_id, parm.eval())
-            elif (parm_id.startswith(MULTIPARM_ID_PREFIX)):
+                attr_values.append((stripped_id, parms_by_name[parm_id].eval()))
+            elif (parm_id in multiparm_id_set):
                 stripped_id = parm_id.removeprefix(MULTIPARM_ID_PREFIX) # python 3.9+
-                add_or_set_detail_attr(target_node, stripped_id, parm.eval())
+                attr_values.append((stripped_id, parms_by_name[parm_id].eval()))
 
         asset_name = 'undefined'
         asset_name_from_node = generator_node.evalParm(PI_ASSET_ID)
 
         if (generator_node.evalParm(PI_ASSET_DEFS_ENABLED) and asset_name_from_node):
             asset_name = asset_name_from_node
-        add_or_set_detail_attr(target_node, JK_ASSET_NAME, asset_name)
+        attr_values.append((JK_ASSET_NAME, asset_name))
+
+        # Repeated cooks with unchanged parm values are common in the manual
+        # (non-PDG) flow, so remember what was last written for this target
+        # node and let set_detail_attrs skip the no-op writes.
+        last_values = _LAST_ATTRS.setdefault(target_node.sessionId(), {})
+        set_detail_attrs(target_node, attr_values, last_values)
 
 def generate_work_items(node, item_holder, json_file_path):
     json_data = load_json_data(node, json_file_path)
@@ -613,15 +860,22 @@ def generate_work_items(node, item_holder, json_file_path):
         log(node, 'error: expected json to have key: ' + JK_ALL_DEFS)
         return
     
-    for index, asset_def in enumerate(json_data[JK_ALL_DEFS]):
-        work_item = item_holder.addWorkItem()
-
-        if (JK_ASSET_NAME in asset_def):
-            work_item.setStringAttrib(WIA_ASSET_NAME, asset_def[JK_ASSET_NAME])
-        else:
-            work_item.setStringAttrib(WIA_ASSET_NAME, 'unknown_' + str(index))
+    # Resolve all the asset names up front so the loop below is nothing but
+    # the unavoidable per-item PDG calls. The attribute ids and the add fn
+    # are bound to locals since this can run for hundreds of asset defs.
+    asset_names = [
+        asset_def.get(JK_ASSET_NAME, 'unknown_' + str(index))
+        for index, asset_def in enumerate(json_data[JK_ALL_DEFS])
+    ]
+    name_attr_id = WIA_ASSET_NAME
+    index_attr_id = WIA_ASSET_INDEX
+    add_work_item = item_holder.addWorkItem
+
+    for index, asset_name in enumerate(asset_names):
+        work_item = add_work_item()
+        work_item.setStringAttrib(name_attr_id, asset_name)
 
         # It's probably fine to just use @index, but this is a little safer
         # since even if the work items get shuffled up, this index will still be
         # valid.
-        work_item.setIntAttrib(WIA_ASSET_INDEX, index)
\ No newline at end of file
+        work_item.setIntAttrib(index_attr_id, index)
\ No newline at end of file